@@ -0,0 +1,77 @@
+"""
+Cold-start benchmark for the backend.
+
+Each run starts a fresh interpreter and measures:
+  - import:        time to `import main`
+  - first request: create_app() + startup hook + first GET /api/menu
+  - provider init: first get_client() call (imports and builds the OpenAI client)
+
+Usage: python bench_startup.py [--runs N]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs inside a fresh interpreter and prints timings as JSON
+PROBE = """
+import json, time, asyncio
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+import httpx
+httpx_ready = time.perf_counter()
+
+
+async def first_request():
+    app = main.create_app(main.AppConfig(load_dotenv=False, openai_api_key="sk-bench"))
+    # ASGITransport does not run the lifespan, so run the startup hook explicitly
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get("/api/menu")
+            assert response.status_code == 200
+        return app, time.perf_counter()
+
+app, first_request_done = asyncio.run(first_request())
+
+provider_start = time.perf_counter()
+main.get_client(app.state)
+provider_ready = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - start,
+    "first request": first_request_done - httpx_ready,
+    "provider init": provider_ready - provider_start,
+}))
+"""
+
+
+def run_once() -> dict:
+    output = subprocess.check_output([sys.executable, "-c", PROBE], cwd=BACKEND_DIR)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend import time and time-to-first-request.")
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters to start")
+    args = parser.parse_args()
+
+    print(f"Running {args.runs} cold starts...")
+    results = [run_once() for _ in range(args.runs)]
+
+    print("-" * 40)
+    for stage in results[0]:
+        samples = [r[stage] * 1000 for r in results]
+        print(f"{stage:<15} median {statistics.median(samples):8.1f} ms   "
+              f"min {min(samples):8.1f} ms   max {max(samples):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Incremental asset builder for menu images.
+
+Combines the placeholder and download scripts into one command. A content-hash
+manifest next to this script records what every image was built from, so only
+images whose spec changed (or whose file was edited/removed) get rebuilt.
+
+Usage:
+    python build_assets.py placeholders [--renderer solid|labelled] [--jobs N]
+    python build_assets.py download [--concurrency N] [--timeout SECONDS]
+    python build_assets.py placeholders|download --force   # ignore the manifest
+"""
+
+import os
+import io
+import sys
+import json
+import zlib
+import struct
+import asyncio
+import hashlib
+import argparse
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+MENU_DIR = os.path.join(BACKEND_DIR, "static", "Menu")
+# Kept outside static/, which the app serves
+MANIFEST_FILE = os.path.join(BACKEND_DIR, ".asset_manifest.json")
+
+# Edge length in pixels produced by each placeholder renderer
+PLACEHOLDER_SIZES = {"solid": 200, "labelled": 300}
+
+# Menu image files with placeholder colors and source URLs
+ASSETS = {
+    "Big_Burger_Combo.png": {
+        "color": (255, 107, 53),
+        "url": "https://images.unsplash.com/photo-1568901346375-23c9450c58cd?w=400&h=400&fit=crop&auto=format",
+    },
+    "Double_Cheeseburger.png": {
+        "color": (247, 147, 30),
+        "url": "https://images.unsplash.com/photo-1586190848861-99aa4a171e90?w=400&h=400&fit=crop&auto=format",
+    },
+    "Cheeseburger.png": {
+        "color": (255, 179, 71),
+        "url": "https://images.unsplash.com/photo-1550547660-d9450f859349?w=400&h=400&fit=crop&auto=format",
+    },
+    "Hamburger.png": {
+        "color": (139, 69, 19),
+        "url": "https://images.unsplash.com/photo-1571091718767-18b5b1457add?w=400&h=400&fit=crop&auto=format",
+    },
+    "Crispy_Chicken_Sandwich.png": {
+        "color": (222, 184, 135),
+        "url": "https://images.unsplash.com/photo-1606755962773-d324e0a13086?w=400&h=400&fit=crop&auto=format",
+    },
+    "Chicken_Nuggets__6_pc.png": {
+        "color": (218, 165, 32),
+        "url": "https://images.unsplash.com/photo-1562967914-608f82629710?w=400&h=400&fit=crop&auto=format",
+    },
+    "Filet_Fish_Sandwich.png": {
+        "color": (70, 130, 180),
+        "url": "https://images.unsplash.com/photo-1521305916504-4a1121188589?w=400&h=400&fit=crop&auto=format",
+    },
+    "Fries.png": {
+        "color": (255, 215, 0),
+        "url": "https://images.unsplash.com/photo-1573080496219-bb080dd4f877?w=400&h=400&fit=crop&auto=format",
+    },
+    "Apple_Pie.png": {
+        "color": (205, 133, 63),
+        "url": "https://images.unsplash.com/photo-1535920527002-b35e96722eb9?w=400&h=400&fit=crop&auto=format",
+    },
+    "coca_cola.png": {
+        "color": (220, 20, 60),
+        "url": "https://images.unsplash.com/photo-1554866585-cd94860890b7?w=400&h=400&fit=crop&auto=format",
+    },
+}
+
+
+def log(message: str):
+    print(message)
+
+
+def encode_png(width: int, height: int, r: int, g: int, b: int) -> bytes:
+    """Encode a solid color RGB PNG.
+
+    The pixel buffer is built by repeating one scanline rather than appending
+    bytes per pixel, so cost is linear in the image size.
+    """
+    def make_chunk(chunk_type, data):
+        chunk_len = struct.pack('>I', len(data))
+        chunk_crc = struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
+        return chunk_len + chunk_type + data + chunk_crc
+
+    signature = b'\x89PNG\r\n\x1a\n'
+    ihdr = make_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    # Filter byte followed by the row's pixels, repeated for every row
+    scanline = b'\x00' + bytes((r, g, b)) * width
+    idat = make_chunk(b'IDAT', zlib.compress(scanline * height, 9))
+
+    iend = make_chunk(b'IEND', b'')
+    return signature + ihdr + idat + iend
+
+
+def render_labelled(filename: str, r: int, g: int, b: int) -> bytes:
+    """Render a labelled placeholder with Pillow (see generate_placeholders.py)."""
+    from generate_placeholders import create_placeholder
+
+    name = os.path.splitext(filename)[0]
+    size = PLACEHOLDER_SIZES["labelled"]
+    img = create_placeholder(name, "#%02X%02X%02X" % (r, g, b), "", size=(size, size))
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def render_placeholder(job: tuple) -> tuple:
+    """Process pool worker: render one placeholder, return (filename, png bytes)."""
+    filename, renderer, (r, g, b) = job
+    if renderer == "labelled":
+        return filename, render_labelled(filename, r, g, b)
+    size = PLACEHOLDER_SIZES["solid"]
+    return filename, encode_png(size, size, r, g, b)
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: str) -> Optional[str]:
+    """Return the sha256 of a file on disk, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return sha256(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def spec_digest(spec: dict) -> str:
+    """Hash of everything an image is built from."""
+    return sha256(json.dumps(spec, sort_keys=True).encode())
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest: dict):
+    tmp_file = MANIFEST_FILE + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, MANIFEST_FILE)
+
+
+def is_current(manifest: dict, filename: str, spec: dict) -> bool:
+    """True if the file on disk is exactly what the manifest says we built."""
+    entry = manifest.get(filename)
+    if not entry or entry.get("spec") != spec_digest(spec):
+        return False
+    return file_digest(os.path.join(MENU_DIR, filename)) == entry.get("sha256")
+
+
+def write_asset(filename: str, data: bytes):
+    path = os.path.join(MENU_DIR, filename)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_placeholders(manifest: dict, renderer: str = "solid", jobs: int = None, force: bool = False) -> dict:
+    """Render out-of-date placeholders on a process pool."""
+    pending = []
+    specs = {}
+    for filename, asset in ASSETS.items():
+        spec = {"source": "placeholder", "renderer": renderer,
+                "color": list(asset["color"]), "size": PLACEHOLDER_SIZES[renderer]}
+        specs[filename] = spec
+        if force or not is_current(manifest, filename, spec):
+            pending.append((filename, renderer, asset["color"]))
+
+    stats = {"built": 0, "skipped": len(ASSETS) - len(pending), "failed": 0}
+    if not pending:
+        return stats
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [(job[0], pool.submit(render_placeholder, job)) for job in pending]
+        for filename, future in futures:
+            try:
+                _, data = future.result()
+            except Exception as e:
+                log(f"Failed to render {filename}: {e}")
+                stats["failed"] += 1
+                continue
+            write_asset(filename, data)
+            manifest[filename] = {"spec": spec_digest(specs[filename]), "sha256": sha256(data)}
+            stats["built"] += 1
+            log(f"Created: {filename}")
+
+    return stats
+
+
+async def fetch_asset(client, semaphore, manifest: dict, filename: str, spec: dict, force: bool) -> str:
+    """Fetch one image, sending conditional headers when the local copy is intact."""
+    entry = manifest.get(filename, {})
+    headers = {}
+    if not force and is_current(manifest, filename, spec):
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    async with semaphore:
+        try:
+            response = await client.get(spec["url"], headers=headers)
+        except Exception as e:
+            log(f"Failed to download {filename}: {e}")
+            return "failed"
+
+    if response.status_code == 304:
+        return "skipped"
+    if response.status_code != 200:
+        log(f"Failed to download {filename}: HTTP {response.status_code}")
+        return "failed"
+
+    data = response.content
+    write_asset(filename, data)
+    manifest[filename] = {
+        "spec": spec_digest(spec),
+        "sha256": sha256(data),
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+    }
+    log(f"Downloaded: {filename}")
+    return "built"
+
+
+async def download_images(manifest: dict, concurrency: int = 8, timeout: float = 30.0, force: bool = False) -> dict:
+    """Fetch all images with bounded concurrency."""
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
+    async with httpx.AsyncClient(timeout=timeout, headers=headers, follow_redirects=True) as client:
+        results = await asyncio.gather(*(
+            fetch_asset(client, semaphore, manifest, filename,
+                        {"source": "download", "url": asset["url"]}, force)
+            for filename, asset in ASSETS.items()
+        ))
+
+    stats = {"built": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        stats[result] += 1
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build menu image assets incrementally.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Options shared by every command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--force", action="store_true", help="rebuild everything, ignoring the manifest")
+
+    placeholders = subparsers.add_parser("placeholders", parents=[common], help="render placeholder images")
+    placeholders.add_argument("--renderer", choices=["solid", "labelled"], default="solid",
+                              help="solid color (no dependencies) or labelled (requires Pillow)")
+    placeholders.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+
+    download = subparsers.add_parser("download", parents=[common], help="download food images")
+    download.add_argument("--concurrency", type=int, default=8, help="maximum requests in flight")
+    download.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+
+    args = parser.parse_args(argv)
+
+    os.makedirs(MENU_DIR, exist_ok=True)
+    manifest = load_manifest()
+
+    try:
+        if args.command == "placeholders":
+            log("Building placeholder images...")
+            stats = build_placeholders(manifest, args.renderer, args.jobs, args.force)
+        else:
+            log("Downloading food images...")
+            stats = asyncio.run(download_images(manifest, args.concurrency, args.timeout, args.force))
+    finally:
+        save_manifest(manifest)
+
+    log("-" * 40)
+    log(f"Built: {stats['built']}, Up to date: {stats['skipped']}, Failed: {stats['failed']}")
+    return stats
+
+
+if __name__ == "__main__":
+    stats = main()
+    sys.exit(1 if stats["failed"] else 0)
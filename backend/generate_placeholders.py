@@ -2,28 +2,14 @@
 Script to generate placeholder images for menu items.
 Run this once to create placeholder images, then replace with actual images.
 
+Equivalent to: python build_assets.py placeholders --renderer labelled
+
 Requirements: pip install Pillow
 """
 
 from PIL import Image, ImageDraw, ImageFont
-import os
-
-# Create Menu directory if it doesn't exist
-os.makedirs("static/Menu", exist_ok=True)
-
-# Menu items with colors
-items = {
-    "Big_Burger_Combo": {"color": "#FF6B35", "emoji": "🍔🍟🥤"},
-    "Double_Cheeseburger": {"color": "#F7931E", "emoji": "🍔🍔"},
-    "Cheeseburger": {"color": "#FFB347", "emoji": "🍔"},
-    "Hamburger": {"color": "#8B4513", "emoji": "🍔"},
-    "Crispy_Chicken_Sandwich": {"color": "#DEB887", "emoji": "🍗"},
-    "Chicken_Nuggets__6_pc": {"color": "#DAA520", "emoji": "🍗"},
-    "Filet_Fish_Sandwich": {"color": "#4682B4", "emoji": "🐟"},
-    "Fries": {"color": "#FFD700", "emoji": "🍟"},
-    "Apple_Pie": {"color": "#CD853F", "emoji": "🥧"},
-    "coca_cola": {"color": "#DC143C", "emoji": "🥤"},
-}
+
+from build_assets import main as build_assets
 
 
 def hex_to_rgb(hex_color):
@@ -69,16 +55,8 @@ def create_placeholder(name, color, emoji, size=(300, 300)):
 
 
 def main():
-    print("Generating placeholder images...")
-
-    for name, props in items.items():
-        img = create_placeholder(name, props["color"], props["emoji"])
-        filepath = f"static/Menu/{name}.png"
-        img.save(filepath, "PNG")
-        print(f"Created: {filepath}")
-
-    print("\nDone! Replace these placeholders with actual food images.")
-    print("Image files should be placed in: backend/static/Menu/")
+    # Rendering and change tracking are handled by build_assets.py
+    build_assets(["placeholders", "--renderer", "labelled"])
 
 
 if __name__ == "__main__":
@@ -2,33 +2,43 @@ import os
 import json
 import base64
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import APIRouter, FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from dotenv import load_dotenv
-from openai import OpenAI
+from order_feed import OrderFeed, SubscriberEvicted
+from sales_stats import RESOLUTIONS, SalesStats
+from session_recorder import RecordingWebSocket, open_recorder
 
-load_dotenv()
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 
-app = FastAPI(title="Voice Restaurant Ordering System")
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+class AppConfig(BaseModel):
+    """Settings for create_app. The API key and recording directory fall back
+    to OPENAI_API_KEY and RECORD_SESSIONS_DIR."""
+    openai_api_key: Optional[str] = None
+    record_sessions_dir: Optional[str] = None
+    static_dir: str = STATIC_DIR
+    cors_origins: list = ["*"]
+    load_dotenv: bool = True
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+router = APIRouter()
+
+
+def get_client(state):
+    """Return the app's OpenAI client, importing and constructing it on first use.
+
+    `state` is the app.state set up by create_app.
+    """
+    if state.openai_client is None:
+        from openai import OpenAI
+        state.openai_client = OpenAI(api_key=state.config.openai_api_key or os.getenv("OPENAI_API_KEY"))
+    return state.openai_client
 
 def log(message: str, level: str = "INFO"):
     """Print detailed log with timestamp."""
@@ -87,13 +97,13 @@ MENU_DATA = {
     }
 }
 
-SYSTEM_PROMPT = f"""You are a friendly voice assistant receptionist at Burger Spot restaurant. You help customers place their orders through natural voice conversation.
+SYSTEM_PROMPT_TEMPLATE = """You are a friendly voice assistant receptionist at Burger Spot restaurant. You help customers place their orders through natural voice conversation.
 
 Available menu items and prices:
-{json.dumps(MENU_DATA['prices'], indent=2)}
+{prices}
 
 Menu descriptions:
-{json.dumps(MENU_DATA['descriptions'], indent=2)}
+{descriptions}
 
 MENU ITEM NAME MAPPING (use exact names from this list):
 - "Big Burger Combo" - for combo, burger combo, big burger
@@ -144,9 +154,20 @@ CRITICAL RULES:
 4. Match item names flexibly but output EXACT menu names in detected_items and items
 5. Respond in the language the customer requested - be fluent and natural in that language"""
 
+# Built by the startup hook (or on first use)
+SYSTEM_PROMPT = None
+MENU_RESPONSE = None
+
 # In-memory storage
 orders = []
 
+# Push feed of order events for kitchen displays
+order_feed = OrderFeed()
+FEED_KEEPALIVE_SECONDS = 15
+
+# Sales counters updated on every confirmed order
+sales_stats = SalesStats()
+
 # Item name aliases for flexible matching
 ITEM_ALIASES = {
     "big burger combo": "Big Burger Combo",
@@ -203,7 +224,30 @@ def normalize_item_name(name: str) -> str:
     return None
 
 
-def generate_speech(text: str) -> bytes:
+def get_system_prompt() -> str:
+    """Return the system prompt, rendering it from MENU_DATA on first use."""
+    global SYSTEM_PROMPT
+    if SYSTEM_PROMPT is None:
+        SYSTEM_PROMPT = SYSTEM_PROMPT_TEMPLATE.format(
+            prices=json.dumps(MENU_DATA['prices'], indent=2),
+            descriptions=json.dumps(MENU_DATA['descriptions'], indent=2)
+        )
+    return SYSTEM_PROMPT
+
+
+def get_menu_response() -> dict:
+    """Return the /api/menu payload, building it on first use."""
+    global MENU_RESPONSE
+    if MENU_RESPONSE is None:
+        MENU_RESPONSE = {"menu": [
+            {"name": item, "price": MENU_DATA["prices"][item],
+             "image": MENU_DATA["images"][item], "description": MENU_DATA["descriptions"][item]}
+            for item in MENU_DATA["menu_items"]
+        ]}
+    return MENU_RESPONSE
+
+
+def generate_speech(text: str, client) -> bytes:
     """Generate speech audio from text using OpenAI TTS."""
     log(f"Generating speech for: '{text[:50]}...' " if len(text) > 50 else f"Generating speech for: '{text}'")
     try:
@@ -221,7 +265,7 @@ def generate_speech(text: str) -> bytes:
         return None
 
 
-def transcribe_audio(audio_bytes: bytes) -> str:
+def transcribe_audio(audio_bytes: bytes, client) -> str:
     """Transcribe audio using OpenAI Whisper."""
     log(f"Transcribing audio, size: {len(audio_bytes)} bytes")
     try:
@@ -244,11 +288,11 @@ def transcribe_audio(audio_bytes: bytes) -> str:
         return ""
 
 
-def process_with_ai(text: str, conversation_history: list) -> dict:
+def process_with_ai(text: str, conversation_history: list, client) -> dict:
     """Process user input with GPT to extract order info."""
     log(f"Processing with AI: '{text}'")
     try:
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        messages = [{"role": "system", "content": get_system_prompt()}]
 
         # Add conversation history
         for msg in conversation_history[-10:]:
@@ -276,34 +320,128 @@ def process_with_ai(text: str, conversation_history: list) -> dict:
         }
 
 
-@app.get("/")
+@router.get("/")
 async def root():
     return {"message": "Voice Restaurant Ordering System API"}
 
 
-@app.get("/api/menu")
+@router.get("/api/menu")
 async def get_menu():
     """Get full menu."""
-    return {"menu": [
-        {"name": item, "price": MENU_DATA["prices"][item],
-         "image": MENU_DATA["images"][item], "description": MENU_DATA["descriptions"][item]}
-        for item in MENU_DATA["menu_items"]
-    ]}
+    return get_menu_response()
 
 
-@app.get("/api/orders")
+@router.get("/api/orders")
 async def get_orders():
     """Get all orders."""
     return {"orders": orders}
 
 
-@app.websocket("/ws/voice")
+@router.get("/api/analytics")
+async def get_analytics(resolution: str = "minute", window: Optional[int] = None):
+    """Get sales totals and per-minute or per-hour rollups.
+
+    `window` is the number of most recent buckets to include.
+    """
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+    if window is not None and window < 1:
+        raise HTTPException(status_code=400, detail="window must be at least 1")
+    return sales_stats.snapshot(resolution, window)
+
+
+@router.get("/api/orders/stream")
+async def stream_orders(cursor: Optional[int] = None, last_event_id: Optional[int] = Header(None)):
+    """Server-Sent Events feed of order events.
+
+    Reconnecting clients resume from the Last-Event-ID header, or ?cursor=
+    on the first connection. EventSource keeps its original URL when it
+    reconnects, so the header is the more recent position.
+    """
+    if last_event_id is not None:
+        cursor = last_event_id
+    subscriber = order_feed.subscribe(cursor)
+    log(f"Order feed SSE subscriber connected (cursor: {cursor}, subscribers: {len(order_feed.subscribers)})")
+
+    async def event_stream():
+        try:
+            while True:
+                page = await subscriber.get(timeout=FEED_KEEPALIVE_SECONDS)
+                if not page:
+                    yield ": keepalive\n\n"
+                    continue
+                yield "".join(f"id: {event['cursor']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
+                              for event in page)
+        except SubscriberEvicted:
+            log(f"Order feed SSE subscriber evicted at cursor {subscriber.cursor}", "WARN")
+            yield f"event: evicted\ndata: {json.dumps({'type': 'evicted', 'cursor': subscriber.cursor})}\n\n"
+        finally:
+            subscriber.close()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+async def wait_for_disconnect(websocket: WebSocket):
+    """Read (and ignore) client messages until the socket closes."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+
+
+@router.websocket("/ws/orders")
+async def websocket_orders(websocket: WebSocket, cursor: Optional[int] = None):
+    """WebSocket feed of order events, resumable from ?cursor=."""
+    await websocket.accept()
+    subscriber = order_feed.subscribe(cursor)
+    log(f"Order feed WebSocket subscriber connected (cursor: {cursor}, subscribers: {len(order_feed.subscribers)})")
+
+    # Watch for the client closing so the subscriber is dropped immediately
+    disconnect = asyncio.create_task(wait_for_disconnect(websocket))
+    try:
+        while True:
+            next_page = asyncio.create_task(subscriber.get(timeout=FEED_KEEPALIVE_SECONDS))
+            await asyncio.wait({next_page, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnect.done():
+                next_page.cancel()
+                disconnect.result()
+            page = next_page.result()
+            if not page:
+                await websocket.send_json({"type": "keepalive", "cursor": subscriber.cursor})
+                continue
+            for event in page:
+                await websocket.send_text(event["data"])
+    except SubscriberEvicted:
+        log(f"Order feed WebSocket subscriber evicted at cursor {subscriber.cursor}", "WARN")
+        try:
+            await websocket.send_json({"type": "evicted", "cursor": subscriber.cursor})
+            await websocket.close(code=1013)
+        except Exception:
+            pass  # client already gone
+    except WebSocketDisconnect:
+        log("Order feed subscriber disconnected")
+    except Exception as e:
+        log(f"Order feed error: {e}", "ERROR")
+    finally:
+        subscriber.close()
+        disconnect.cancel()
+
+
+@router.websocket("/ws/voice")
 async def websocket_voice(websocket: WebSocket):
     """WebSocket endpoint for voice ordering."""
     await websocket.accept()
     log("=" * 50)
     log("New WebSocket connection established")
 
+    state = websocket.app.state
+
+    # Opt-in session recording for replay_sessions.py
+    recorder = open_recorder(state.config.record_sessions_dir or os.getenv("RECORD_SESSIONS_DIR"))
+    if recorder:
+        websocket = RecordingWebSocket(websocket, recorder)
+
     # Session state
     cart = {"items": [], "total": 0.0}
     conversation_history = []
@@ -323,7 +461,7 @@ async def websocket_voice(websocket: WebSocket):
                 log(f"AGENT SAYS: {welcome_text}")
 
                 # Generate welcome audio
-                audio = generate_speech(welcome_text)
+                audio = recorder.call("tts", generate_speech, welcome_text, get_client(state))
 
                 if audio:
                     audio_b64 = base64.b64encode(audio).decode()
@@ -356,13 +494,14 @@ async def websocket_voice(websocket: WebSocket):
                     continue
 
                 # Transcribe
-                user_text = transcribe_audio(audio_bytes)
+                user_text = recorder.call("transcribe", transcribe_audio, audio_bytes, get_client(state))
 
                 if not user_text or len(user_text.strip()) < 2:
                     log("Empty or too short transcription, ignoring", "WARN")
                     # Only respond if audio was substantial but couldn't be understood
                     if len(audio_bytes) > 30000:
-                        error_audio = generate_speech("I didn't catch that. Could you please repeat?")
+                        error_audio = recorder.call("tts", generate_speech, "I didn't catch that. Could you please repeat?",
+                                                    get_client(state))
                         if error_audio:
                             await websocket.send_json({
                                 "type": "audio",
@@ -376,7 +515,7 @@ async def websocket_voice(websocket: WebSocket):
                 conversation_history.append({"role": "user", "content": user_text})
 
                 # Process with AI
-                ai_result = process_with_ai(user_text, conversation_history)
+                ai_result = recorder.call("ai", process_with_ai, user_text, conversation_history, get_client(state))
 
                 # Add AI response to history
                 conversation_history.append({"role": "assistant", "content": ai_result["response"]})
@@ -454,6 +593,8 @@ async def websocket_voice(websocket: WebSocket):
                             "status": "confirmed"
                         }
                         orders.append(order_data)
+                        order_feed.publish("order_confirmed", order_data)
+                        sales_stats.record(order_data)
                         log(f"ORDER CONFIRMED: #{order_data['id']}, Total: ${order_data['total']:.2f}")
 
                         # Send order confirmation
@@ -495,7 +636,7 @@ async def websocket_voice(websocket: WebSocket):
                 })
 
                 # Generate and send audio response
-                audio = generate_speech(ai_result["response"])
+                audio = recorder.call("tts", generate_speech, ai_result["response"], get_client(state))
 
                 if audio:
                     audio_b64 = base64.b64encode(audio).decode()
@@ -517,10 +658,63 @@ async def websocket_voice(websocket: WebSocket):
         log(f"WebSocket error: {e}", "ERROR")
         import traceback
         traceback.print_exc()
+    finally:
+        recorder.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Precompute menu data and the system prompt before serving requests."""
+    get_system_prompt()
+    get_menu_response()
+    log("Menu and system prompt precomputed")
+    yield
+
+
+def create_app(app_config: Optional[AppConfig] = None) -> FastAPI:
+    """Build the FastAPI application.
+
+    Nothing heavy happens at import time: .env loading happens here, and the
+    OpenAI client is only constructed when the first request needs it.
+    Each app keeps its own config and client on app.state; orders, the order
+    feed and sales stats are still shared by all apps in the process.
+    """
+    app_config = app_config or AppConfig()
+    if app_config.load_dotenv:
+        from dotenv import load_dotenv
+        load_dotenv()
+
+    app = FastAPI(title="Voice Restaurant Ordering System", lifespan=lifespan)
+    app.state.config = app_config
+    app.state.openai_client = None
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=app_config.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Mount static files
+    app.mount("/static", StaticFiles(directory=app_config.static_dir), name="static")
+
+    app.include_router(router)
+    return app
+
+
+def __getattr__(name):
+    # Keep `uvicorn main:app` working without building the app on import
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     import uvicorn
     log("Starting Voice Restaurant Ordering System...")
-    log(f"OpenAI API Key configured: {'Yes' if os.getenv('OPENAI_API_KEY') else 'No'}")
+    app = create_app()
+    log(f"OpenAI API Key configured: {'Yes' if app.state.config.openai_api_key or os.getenv('OPENAI_API_KEY') else 'No'}")
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,139 @@
+"""
+Push feed of order events for kitchen displays and POS bridges.
+
+Every published event gets a monotonically increasing cursor and is kept in a
+bounded history, so a subscriber that reconnects with its last cursor receives
+whatever it missed. The missed events are read from the history a page at a
+time; only events published after a subscriber has caught up go into its own
+bounded buffer. A subscriber that falls behind by more than that buffer is
+evicted instead of slowing the publisher or growing memory without limit.
+"""
+
+import json
+import asyncio
+from collections import deque
+from itertools import islice
+from typing import Optional
+
+
+class SubscriberEvicted(Exception):
+    """Raised to a subscriber that fell too far behind the feed."""
+
+
+class Subscriber:
+    """One consumer of the feed with its own bounded buffer of live events."""
+
+    def __init__(self, feed: "OrderFeed", cursor: int, catching_up: bool, max_buffer: int, page_size: int):
+        self.feed = feed
+        self.max_buffer = max_buffer
+        self.page_size = page_size
+        self.buffer = deque()
+        self.cursor = cursor
+        self.catching_up = catching_up
+        self.evicted = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, event: dict):
+        """Queue a live event, evicting this subscriber if its buffer is full."""
+        if self.evicted:
+            return
+        if self.catching_up:
+            # Still reading the history, which already holds this event
+            pass
+        elif len(self.buffer) >= self.max_buffer:
+            self.evicted = True
+            self.buffer.clear()
+            self.feed.unsubscribe(self)
+        else:
+            self.buffer.append(event)
+        self._wakeup.set()
+
+    def next_page(self) -> list:
+        """Take up to page_size undelivered events without waiting."""
+        if self.catching_up:
+            page = self.feed.events_after(self.cursor, self.page_size)
+            if page:
+                self.cursor = page[-1]["cursor"]
+                return page
+            # History exhausted: from here on publish() feeds the buffer
+            self.catching_up = False
+        page = [self.buffer.popleft() for _ in range(min(self.page_size, len(self.buffer)))]
+        if page:
+            self.cursor = page[-1]["cursor"]
+        return page
+
+    async def get(self, timeout: Optional[float] = None) -> list:
+        """Wait for the next page of events. Returns [] if nothing arrived within timeout."""
+        while True:
+            page = self.next_page()
+            if page:
+                return page
+            if self.evicted:
+                raise SubscriberEvicted(f"subscriber fell behind at cursor {self.cursor}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+
+class OrderFeed:
+    """Fan-out of order events to any number of subscribers."""
+
+    def __init__(self, history_size: int = 1000, subscriber_buffer: int = 100, page_size: int = 50):
+        self.history = deque(maxlen=history_size)
+        self.subscriber_buffer = subscriber_buffer
+        self.page_size = page_size
+        self.subscribers = set()
+        self.cursor = 0
+
+    def publish(self, event_type: str, order: dict) -> dict:
+        """Record an event and push it to all subscribers.
+
+        The payload is serialised once here and shared by every subscriber.
+        """
+        self.cursor += 1
+        event = {
+            "cursor": self.cursor,
+            "type": event_type,
+            "data": json.dumps({"type": event_type, "cursor": self.cursor, "order": order}),
+        }
+        self.history.append(event)
+        for subscriber in list(self.subscribers):
+            subscriber.push(event)
+        return event
+
+    def events_after(self, cursor: int, limit: int) -> list:
+        """Up to limit events from the history following cursor.
+
+        If cursor is older than the retained history (or from before a
+        restart), a single "resync" event carrying the current head is
+        returned instead. The client reloads the full order list, so reading
+        on from the head only delivers orders published after that.
+        """
+        oldest = self.history[0]["cursor"] if self.history else self.cursor + 1
+        # A cursor ahead of the feed means the server restarted since
+        if cursor < oldest - 1 or cursor > self.cursor:
+            return [{
+                "cursor": self.cursor,
+                "type": "resync",
+                "data": json.dumps({"type": "resync", "cursor": self.cursor}),
+            }]
+        # Cursors in the history are contiguous, so the position is direct
+        start = cursor - oldest + 1
+        return list(islice(self.history, start, start + limit))
+
+    def subscribe(self, cursor: Optional[int] = None) -> Subscriber:
+        """Register a subscriber, replaying events after cursor if given."""
+        if cursor is None:
+            subscriber = Subscriber(self, self.cursor, False, self.subscriber_buffer, self.page_size)
+        else:
+            subscriber = Subscriber(self, cursor, True, self.subscriber_buffer, self.page_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
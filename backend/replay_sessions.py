@@ -0,0 +1,239 @@
+"""
+Replay recorded /ws/voice sessions through the current handler.
+
+Sessions recorded with RECORD_SESSIONS_DIR (see session_recorder.py) are fed
+back into websocket_voice in-process. Incoming messages arrive at their
+recorded times (divided by --speedup), and transcription, AI and TTS calls
+return the recorded results instead of calling OpenAI. By default each
+upstream call also blocks for its recorded duration, as the real calls do.
+The report compares time to first reply and full turn time against the
+recording; upstream latencies are listed as recorded, since replay only
+substitutes them back in.
+
+Usage:
+    python replay_sessions.py recordings/ [--concurrency N] [--speedup X]
+                                          [--no-upstream-latency]
+"""
+
+import os
+import copy
+import time
+import asyncio
+import argparse
+from collections import defaultdict, deque
+from contextvars import ContextVar
+
+from fastapi import WebSocketDisconnect
+
+import main
+from session_recorder import SessionRecorder, current_recorder, load_session
+
+UPSTREAM_STAGES = ("transcribe", "ai", "tts")
+HANDLER_STAGES = ("first_send", "turn")
+
+# Recorded upstream results for the session running in the current task
+current_responses = ContextVar("current_responses")
+
+# Returned when the handler makes more upstream calls than were recorded
+FALLBACKS = {
+    "transcribe": "",
+    "ai": {"items": [], "action": "question", "response": "I'm sorry, could you please repeat that?",
+           "detected_items": [], "is_final": False},
+    "tts": None,
+}
+
+
+class ReplayWebSocket:
+    """Feeds recorded incoming messages to the handler at their recorded times."""
+
+    def __init__(self, app, records: list, speedup: float):
+        self.app = app
+        self.incoming = [r for r in records if r["event"] in ("receive", "disconnect")]
+        self.speedup = speedup
+        self.start = time.perf_counter()
+
+    async def accept(self):
+        pass
+
+    async def receive_json(self):
+        if not self.incoming:
+            raise WebSocketDisconnect()
+        record = self.incoming.pop(0)
+        delay = record["t"] / self.speedup - (time.perf_counter() - self.start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if record["event"] == "disconnect":
+            raise WebSocketDisconnect()
+        return copy.deepcopy(record["message"])
+
+    async def send_json(self, message):
+        pass
+
+
+def recorded_upstream(stage: str, simulate_latency: bool):
+    """Build a stand-in for an upstream function that returns recorded results."""
+    def replay(*args):
+        responses = current_responses.get()
+        if not responses[stage]:
+            responses["mismatches"] += 1
+            return copy.deepcopy(FALLBACKS[stage])
+        record = responses[stage].popleft()
+        if simulate_latency:
+            # The real calls are synchronous, so block the loop like they do
+            time.sleep(record["duration"])
+        result = record["result"]
+        if isinstance(result, dict) and set(result) == {"bytes"}:
+            return b"\0" * result["bytes"]
+        return copy.deepcopy(result)
+    return replay
+
+
+def install_upstream(simulate_latency: bool):
+    main.transcribe_audio = recorded_upstream("transcribe", simulate_latency)
+    main.process_with_ai = recorded_upstream("ai", simulate_latency)
+    main.generate_speech = recorded_upstream("tts", simulate_latency)
+
+
+def stage_timings(records: list) -> dict:
+    """Per-stage durations in seconds.
+
+    Besides the upstream stages, "first_send" is the time from receiving a
+    message to the first reply, and "turn" the time to the last reply before
+    the next message arrives.
+    """
+    timings = defaultdict(list)
+    received_at = None
+    first_send = last_send = None
+
+    def close_turn():
+        if received_at is not None and first_send is not None:
+            timings["first_send"].append(first_send - received_at)
+            timings["turn"].append(last_send - received_at)
+
+    for record in records:
+        event = record["event"]
+        if event in UPSTREAM_STAGES:
+            timings[event].append(record["duration"])
+        elif event == "receive":
+            close_turn()
+            received_at, first_send, last_send = record["t"], None, None
+        elif event == "send":
+            if first_send is None:
+                first_send = record["t"]
+            last_send = record["t"]
+    close_turn()
+    return timings
+
+
+def create_replay_app():
+    """App for the handler to read its state from; upstream calls never reach OpenAI."""
+    app = main.create_app(main.AppConfig(load_dotenv=False))
+    app.state.openai_client = object()  # placeholder, the upstream functions are replaced
+    return app
+
+
+async def replay_session(app, records: list, speedup: float) -> tuple:
+    """Run one recorded session through websocket_voice, returning (trace, mismatches)."""
+    responses = {stage: deque(r for r in records if r["event"] == stage) for stage in UPSTREAM_STAGES}
+    responses["mismatches"] = 0
+    current_responses.set(responses)
+
+    recorder = SessionRecorder()
+    current_recorder.set(recorder)
+    await main.websocket_voice(ReplayWebSocket(app, records, speedup))
+    return recorder.records, responses["mismatches"]
+
+
+async def replay_all(sessions: dict, concurrency: int, speedup: float) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    app = create_replay_app()
+
+    async def run(path):
+        async with semaphore:
+            return path, await replay_session(app, sessions[path], speedup)
+
+    return dict(await asyncio.gather(*(run(path) for path in sessions)))
+
+
+def find_sessions(paths: list) -> list:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".jsonl"))
+        else:
+            files.append(path)
+    return files
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def print_report(recorded: dict, replayed: dict, simulate_latency: bool):
+    # Only handler stages are measured in replay; upstream calls are stand-ins
+    print(f"{'stage':<12}{'count':>7}{'recorded p50':>15}{'replay p50':>13}{'delta':>11}"
+          f"{'recorded p95':>15}{'replay p95':>13}{'delta':>11}")
+    for stage in HANDLER_STAGES:
+        before, after = recorded.get(stage), replayed.get(stage)
+        if not before or not after:
+            continue
+        row = f"{stage:<12}{len(after):>7}"
+        for fraction in (0.5, 0.95):
+            old = percentile(before, fraction) * 1000
+            new = percentile(after, fraction) * 1000
+            row += f"{old:>12.1f} ms{new:>10.1f} ms{new - old:>+8.1f} ms"
+        print(row)
+
+    if simulate_latency:
+        print("\nUpstream latency (recorded, substituted back in during replay, not measured):")
+    else:
+        print("\nUpstream latency (recorded; replay returned these results immediately):")
+    for stage in UPSTREAM_STAGES:
+        samples = recorded.get(stage)
+        if not samples:
+            continue
+        print(f"{stage:<12}{len(samples):>7}{percentile(samples, 0.5) * 1000:>12.1f} ms p50"
+              f"{percentile(samples, 0.95) * 1000:>12.1f} ms p95")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Replay recorded voice sessions and compare stage timings.")
+    parser.add_argument("paths", nargs="+", help="session files or directories of them")
+    parser.add_argument("--concurrency", type=int, default=1, help="sessions replayed at once")
+    parser.add_argument("--speedup", type=float, default=1.0,
+                        help="divide the gaps between client messages by this factor")
+    parser.add_argument("--no-upstream-latency", action="store_true",
+                        help="return recorded upstream results immediately instead of after their recorded duration")
+    args = parser.parse_args()
+
+    files = find_sessions(args.paths)
+    if not files:
+        parser.error("no recorded sessions found")
+    sessions = {path: load_session(path) for path in files}
+
+    install_upstream(not args.no_upstream_latency)
+    print(f"Replaying {len(sessions)} session(s), concurrency {args.concurrency}, speedup {args.speedup}x...")
+    started = time.perf_counter()
+    results = asyncio.run(replay_all(sessions, args.concurrency, args.speedup))
+    wall_time = time.perf_counter() - started
+
+    recorded, replayed = defaultdict(list), defaultdict(list)
+    mismatches = 0
+    for path, (trace, session_mismatches) in results.items():
+        mismatches += session_mismatches
+        for stage, samples in stage_timings(sessions[path]).items():
+            recorded[stage].extend(samples)
+        for stage, samples in stage_timings(trace).items():
+            replayed[stage].extend(samples)
+
+    print("-" * 97)
+    print_report(recorded, replayed, not args.no_upstream_latency)
+    print("-" * 97)
+    print(f"Wall time: {wall_time:.2f}s")
+    if mismatches:
+        print(f"Warning: {mismatches} upstream call(s) had no recorded response; the handler diverged from the recording.")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,118 @@
+"""
+Sales counters maintained incrementally as orders are confirmed.
+
+Totals are kept for the lifetime of the process, plus per-minute and per-hour
+buckets with bounded retention. Reading the stats walks the buckets, never
+the order list, so cost is independent of how many orders were taken.
+"""
+
+import time
+from collections import deque
+from typing import Optional
+
+RESOLUTIONS = {"minute": 60, "hour": 3600}
+
+
+def new_bucket(start: int) -> dict:
+    return {"start": start, "orders": 0, "revenue": 0.0, "items": {}}
+
+
+def add_order(bucket: dict, order: dict):
+    """Fold one order into a bucket's counters."""
+    bucket["orders"] += 1
+    bucket["revenue"] += order["total"]
+    for item in order["items"]:
+        counts = bucket["items"].setdefault(item["name"], {"quantity": 0, "revenue": 0.0})
+        counts["quantity"] += item["quantity"]
+        counts["revenue"] += item["price"] * item["quantity"]
+
+
+def merge_buckets(buckets) -> dict:
+    """Sum several buckets into one."""
+    merged = new_bucket(0)
+    for bucket in buckets:
+        merged["orders"] += bucket["orders"]
+        merged["revenue"] += bucket["revenue"]
+        for name, counts in bucket["items"].items():
+            total = merged["items"].setdefault(name, {"quantity": 0, "revenue": 0.0})
+            total["quantity"] += counts["quantity"]
+            total["revenue"] += counts["revenue"]
+    return merged
+
+
+def format_bucket(bucket: dict) -> dict:
+    """Round money and add the average ticket for API output."""
+    return {
+        "orders": bucket["orders"],
+        "revenue": round(bucket["revenue"], 2),
+        "average_ticket": round(bucket["revenue"] / bucket["orders"], 2) if bucket["orders"] else 0.0,
+        "items": {
+            name: {"quantity": counts["quantity"], "revenue": round(counts["revenue"], 2)}
+            for name, counts in sorted(bucket["items"].items())
+        },
+    }
+
+
+class TimeBuckets:
+    """Fixed-width time buckets, keeping at most `retention` of them."""
+
+    def __init__(self, width: int, retention: int):
+        self.width = width
+        self.retention = retention
+        self.buckets = deque()
+
+    def add(self, order: dict, timestamp: float):
+        start = int(timestamp // self.width) * self.width
+        # Orders arrive in time order, so the match is almost always the last bucket
+        index = len(self.buckets)
+        while index and self.buckets[index - 1]["start"] > start:
+            index -= 1
+        if index and self.buckets[index - 1]["start"] == start:
+            add_order(self.buckets[index - 1], order)
+            return
+        if index == 0 and len(self.buckets) >= self.retention:
+            return  # older than anything retained
+        bucket = new_bucket(start)
+        add_order(bucket, order)
+        self.buckets.insert(index, bucket)
+        while len(self.buckets) > self.retention:
+            self.buckets.popleft()
+
+    def recent(self, count: int, now: float) -> list:
+        """Buckets within the last `count` bucket widths, oldest first."""
+        oldest = (int(now // self.width) - count + 1) * self.width
+        return [b for b in self.buckets if b["start"] >= oldest]
+
+
+class SalesStats:
+    """Running totals plus per-minute and per-hour rollups."""
+
+    def __init__(self, minute_retention: int = 120, hour_retention: int = 168):
+        self.totals = new_bucket(0)
+        self.series = {
+            "minute": TimeBuckets(RESOLUTIONS["minute"], minute_retention),
+            "hour": TimeBuckets(RESOLUTIONS["hour"], hour_retention),
+        }
+
+    def record(self, order: dict, timestamp: Optional[float] = None):
+        """Count a confirmed order."""
+        timestamp = time.time() if timestamp is None else timestamp
+        add_order(self.totals, order)
+        for buckets in self.series.values():
+            buckets.add(order, timestamp)
+
+    def snapshot(self, resolution: str = "minute", window: Optional[int] = None,
+                 now: Optional[float] = None) -> dict:
+        """Totals, a summary of the last `window` buckets, and the bucket series."""
+        buckets = self.series[resolution]
+        window = buckets.retention if window is None else min(window, buckets.retention)
+        now = time.time() if now is None else now
+        recent = buckets.recent(window, now)
+
+        return {
+            "resolution": resolution,
+            "window": window,
+            "totals": format_bucket(self.totals),
+            "window_totals": format_bucket(merge_buckets(recent)),
+            "buckets": [{"start": b["start"], **format_bucket(b)} for b in recent],
+        }
@@ -0,0 +1,121 @@
+"""
+Opt-in recorder for /ws/voice sessions.
+
+Each session is written to its own append-only JSON Lines file: incoming
+messages (including the base64 audio), every upstream call (transcription,
+AI, TTS) with its result and duration, and the time and type of every
+outgoing message. Times are seconds since the session started.
+
+TTS audio is stored as its size only; replay_sessions.py substitutes
+silence of the same length.
+"""
+
+import os
+import json
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+FORMAT_VERSION = 1
+
+# Lets replay_sessions.py hand the handler an in-memory recorder
+current_recorder = ContextVar("current_recorder", default=None)
+
+
+class SessionRecorder:
+    """Writes one session's events, or keeps them in memory if path is None."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.records = [] if path is None else None
+        self.file = open(path, "a") if path else None
+        self.start = time.perf_counter()
+        self.record("session", started=time.time(), version=FORMAT_VERSION)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def record(self, event: str, t: Optional[float] = None, **fields):
+        record = {"event": event, "t": round(self.elapsed() if t is None else t, 6), **fields}
+        if self.file:
+            self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self.file.flush()
+        else:
+            self.records.append(record)
+
+    def call(self, stage: str, func, *args):
+        """Call an upstream function, recording its result and duration."""
+        started = self.elapsed()
+        result = func(*args)
+        duration = self.elapsed() - started
+        stored = {"bytes": len(result)} if isinstance(result, bytes) else result
+        self.record(stage, t=started, duration=round(duration, 6), result=stored)
+        return result
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class NullRecorder:
+    """Stand-in used when recording is disabled."""
+
+    def __bool__(self):
+        return False
+
+    def record(self, event: str, t: Optional[float] = None, **fields):
+        pass
+
+    def call(self, stage: str, func, *args):
+        return func(*args)
+
+    def close(self):
+        pass
+
+
+NULL_RECORDER = NullRecorder()
+
+
+class RecordingWebSocket:
+    """Wraps a WebSocket, recording messages received and sent."""
+
+    def __init__(self, websocket, recorder: SessionRecorder):
+        self.websocket = websocket
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self.websocket, name)
+
+    async def receive_json(self):
+        try:
+            message = await self.websocket.receive_json()
+        except Exception:
+            self.recorder.record("disconnect")
+            raise
+        self.recorder.record("receive", message=message)
+        return message
+
+    async def send_json(self, message):
+        await self.websocket.send_json(message)
+        self.recorder.record("send", type=message.get("type"))
+
+
+def open_recorder(directory: Optional[str]):
+    """Start recording a session into directory, or return NULL_RECORDER if unset."""
+    recorder = current_recorder.get()
+    if recorder is not None:
+        return recorder
+    if not directory:
+        return NULL_RECORDER
+    os.makedirs(directory, exist_ok=True)
+    filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.jsonl"
+    return SessionRecorder(os.path.join(directory, filename))
+
+
+def load_session(path: str) -> list:
+    """Read a recorded session back as a list of records."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
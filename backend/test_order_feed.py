@@ -0,0 +1,112 @@
+"""Tests for order_feed.py: cursors, paging, resync and eviction."""
+
+import asyncio
+import json
+
+import pytest
+
+from order_feed import OrderFeed, SubscriberEvicted
+
+
+def publish(feed, count):
+    for i in range(count):
+        feed.publish("order_confirmed", {"id": feed.cursor + 1})
+
+
+def drain(subscriber):
+    """Read pages until the subscriber has nothing more to deliver."""
+    async def read():
+        events = []
+        while True:
+            page = await subscriber.get(timeout=0)
+            if not page:
+                return events
+            events.extend(page)
+    return asyncio.run(read())
+
+
+def cursors(events):
+    return [event["cursor"] for event in events]
+
+
+def test_resume_inside_history_replays_missed_events_in_pages():
+    feed = OrderFeed(history_size=1000, subscriber_buffer=10, page_size=50)
+    publish(feed, 150)
+    subscriber = feed.subscribe(20)
+
+    first_page = asyncio.run(subscriber.get(timeout=0))
+    assert cursors(first_page) == list(range(21, 71))
+
+    # Events published while catching up are read from history, not buffered
+    publish(feed, 30)
+    assert not subscriber.evicted
+    assert cursors(drain(subscriber)) == list(range(71, 181))
+    assert not subscriber.catching_up
+
+
+def test_resume_from_cursor_older_than_history_resyncs_to_head():
+    feed = OrderFeed(history_size=5)
+    publish(feed, 20)
+    subscriber = feed.subscribe(3)
+
+    events = drain(subscriber)
+    assert [(e["type"], e["cursor"]) for e in events] == [("resync", 20)]
+    assert json.loads(events[0]["data"]) == {"type": "resync", "cursor": 20}
+
+    publish(feed, 1)
+    assert cursors(drain(subscriber)) == [21]
+
+
+def test_resume_from_cursor_ahead_of_head_resyncs_to_head():
+    feed = OrderFeed(history_size=5)
+    publish(feed, 20)
+    subscriber = feed.subscribe(10 ** 6)
+
+    assert [(e["type"], e["cursor"]) for e in drain(subscriber)] == [("resync", 20)]
+    publish(feed, 2)
+    assert cursors(drain(subscriber)) == [21, 22]
+
+
+def test_resume_after_restart_with_empty_history_resyncs():
+    feed = OrderFeed()
+    subscriber = feed.subscribe(42)
+
+    assert [(e["type"], e["cursor"]) for e in drain(subscriber)] == [("resync", 0)]
+    publish(feed, 1)
+    assert cursors(drain(subscriber)) == [1]
+
+
+def test_live_subscriber_is_evicted_when_buffer_is_full():
+    feed = OrderFeed(subscriber_buffer=3)
+    subscriber = feed.subscribe()
+    publish(feed, 2)
+    assert cursors(asyncio.run(subscriber.get(timeout=0))) == [1, 2]
+
+    publish(feed, 4)
+    assert subscriber.evicted
+    assert subscriber not in feed.subscribers
+    with pytest.raises(SubscriberEvicted):
+        asyncio.run(subscriber.get(timeout=0))
+    assert subscriber.cursor == 2
+
+
+def test_resume_after_eviction_delivers_everything_missed():
+    feed = OrderFeed(subscriber_buffer=3)
+    subscriber = feed.subscribe()
+    publish(feed, 4)
+    assert subscriber.evicted
+
+    resumed = feed.subscribe(subscriber.cursor)
+    assert cursors(drain(resumed)) == [1, 2, 3, 4]
+    publish(feed, 2)
+    assert cursors(drain(resumed)) == [5, 6]
+    assert not resumed.evicted
+
+
+def test_closed_subscriber_stops_receiving():
+    feed = OrderFeed()
+    subscriber = feed.subscribe()
+    subscriber.close()
+    publish(feed, 1)
+    assert feed.subscribers == set()
+    assert drain(subscriber) == []